@@ -0,0 +1,8 @@
+window.YTD.account.part0 = [
+  {
+    "account": {
+      "accountId": "42",
+      "username": "someone"
+    }
+  }
+]
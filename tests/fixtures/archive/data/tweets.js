@@ -0,0 +1,65 @@
+window.YTD.tweets.part0 = [
+  {
+    "tweet": {
+      "id": "1100",
+      "id_str": "1100",
+      "full_text": "Archived 1100"
+    }
+  },
+  {
+    "tweet": {
+      "id": "1101",
+      "id_str": "1101",
+      "full_text": "Archived 1101"
+    }
+  },
+  {
+    "tweet": {
+      "id": "1102",
+      "id_str": "1102",
+      "full_text": "Archived 1102"
+    }
+  },
+  {
+    "tweet": {
+      "id": "1103",
+      "id_str": "1103",
+      "full_text": "Archived 1103"
+    }
+  },
+  {
+    "tweet": {
+      "id": "1104",
+      "id_str": "1104",
+      "full_text": "Archived 1104"
+    }
+  },
+  {
+    "tweet": {
+      "id": "1105",
+      "id_str": "1105",
+      "full_text": "Archived 1105"
+    }
+  },
+  {
+    "tweet": {
+      "id": "1106",
+      "id_str": "1106",
+      "full_text": "Archived 1106"
+    }
+  },
+  {
+    "tweet": {
+      "id": "1107",
+      "id_str": "1107",
+      "full_text": "Archived 1107"
+    }
+  },
+  {
+    "tweet": {
+      "id": "1200",
+      "id_str": "1200",
+      "full_text": "Archived 1200"
+    }
+  }
+]
@@ -0,0 +1,100 @@
+'''
+Checks exporting tweets, against a copy of the fixture archive in
+tests/fixtures/archive (see test_verify for its contents).
+
+Run from the repository root with:
+
+    python -m unittest discover -s tests
+'''
+import gzip
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from twitter_archive_expander import TwitterArchiveFolder, parse_js_file_list
+
+
+FIXTURE_DIR = Path(__file__).parent / 'fixtures' / 'archive'
+USER_DICT = {'id_str': '42', 'screen_name': 'someone'}
+ARCHIVED_IDS = [1100, 1101, 1102, 1103, 1104, 1105, 1106, 1107, 1200]
+
+
+class ExportTest(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = Path(temp_dir.name)
+        self.base_dir = self.temp_dir / 'archive'
+        shutil.copytree(FIXTURE_DIR, self.base_dir)
+        self.archive = TwitterArchiveFolder(
+            self.base_dir, user_dict=USER_DICT,
+        )
+
+    def export_ndjson(self, output_file):
+        with self.assertLogs(level='WARNING') as logs:
+            num_written = self.archive.export_tweets(
+                output_file, max_workers=2,
+            )
+        self.assertEqual(num_written, len(ARCHIVED_IDS))
+        opener = gzip.open if output_file.suffix == '.gz' else open
+        with opener(output_file, 'rt', encoding='utf-8') as f:
+            tweets = [json.loads(line) for line in f]
+        return tweets, logs.output
+
+    def test_export_ndjson(self):
+        tweets, warnings = self.export_ndjson(self.temp_dir / 'out.ndjson')
+
+        self.assertEqual([int(t['id_str']) for t in tweets], ARCHIVED_IDS)
+        by_id = {t['id_str']: t for t in tweets}
+        # Expanded where saved and valid
+        self.assertEqual(by_id['1100']['full_text'], 'Tweet 1100')
+        self.assertEqual(by_id['1106']['full_text'], 'Tweet 1106')
+        # Archived otherwise
+        self.assertEqual(by_id['1101']['full_text'], 'Archived 1101')
+        self.assertEqual(by_id['1105']['full_text'], 'Archived 1105')
+        # Files holding some other tweet are not used in its place
+        self.assertEqual(by_id['1103']['full_text'], 'Archived 1103')
+        self.assertEqual(by_id['1104']['full_text'], 'Archived 1104')
+        self.assertEqual(by_id['1107']['full_text'], 'Archived 1107')
+        self.assertTrue(any('contains tweet 9999' in w for w in warnings))
+
+    def test_export_gzip(self):
+        tweets, _ = self.export_ndjson(self.temp_dir / 'out.ndjson.gz')
+
+        self.assertEqual([int(t['id_str']) for t in tweets], ARCHIVED_IDS)
+
+    def test_export_unreadable_file(self):
+        # Something other than a file where a saved tweet should be
+        saved_path = self.base_dir / 'expanded' / '11' / '1100.json'
+        saved_path.unlink()
+        saved_path.mkdir()
+
+        tweets, _ = self.export_ndjson(self.temp_dir / 'out.ndjson')
+
+        self.assertEqual(tweets[0]['full_text'], 'Archived 1100')
+
+    def test_export_tweets_js(self):
+        output_file = self.temp_dir / 'tweets.js'
+        with self.assertLogs(level='WARNING'):
+            self.archive.export_tweets(
+                output_file, output_format='js', max_workers=2,
+            )
+
+        self.assertTrue(output_file.read_text().startswith(
+            TwitterArchiveFolder.TWEETS_JS_PREFIX
+        ))
+        items = parse_js_file_list(output_file)
+        self.assertEqual(
+            [int(item['tweet']['id_str']) for item in items], ARCHIVED_IDS,
+        )
+        self.assertEqual(
+            [p.name for p in self.temp_dir.iterdir() if p.is_file()],
+            ['tweets.js'],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,264 @@
+'''
+Checks the API transport settings against a local stand-in server.
+
+Run from the repository root with:
+
+    python -m unittest discover -s tests
+'''
+import gzip
+import json
+import ssl
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+import tweepy
+import tweepy.errors
+
+from twitter_archive_expander import (
+    TransportConfig,
+    configure_session,
+    create_client,
+)
+
+
+BODY = json.dumps([
+    {
+        'id_str': str(1500000000000000000 + i),
+        'full_text': 'x' * 200,
+        'user': {'id_str': '42', 'screen_name': 'someone'},
+    }
+    for i in range(100)
+]).encode()
+
+STALL_SECS = 1.0
+
+# Self-signed certificate and key for 127.0.0.1, as the API client only
+# makes HTTPS requests
+CERT_FILE = Path(__file__).parent / 'fixtures' / 'localhost.pem'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        self.do_GET()
+
+    def do_GET(self):
+        server = self.server
+        # API client requests are under /1.1/ and have query strings, so only
+        # the last part of the path is used to pick a response
+        path = urlsplit(self.path).path
+        name = path.rsplit('/', 1)[-1].split('.', 1)[0]
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.hits[name] = server.hits.get(name, 0) + 1
+
+        if name == 'stall':
+            time.sleep(STALL_SECS)
+
+        data = BODY
+        compress = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if compress:
+            data = gzip.compress(data)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+
+        try:
+            if name == 'chunked':
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for i in range(0, len(data), 100):
+                    chunk = data[i:i+100]
+                    self.wfile.write(f'{len(chunk):x}\r\n'.encode())
+                    self.wfile.write(chunk + b'\r\n')
+                self.wfile.write(b'0\r\n\r\n')
+            else:
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+        except (ConnectionError, ssl.SSLError):
+            # Client gave up waiting, as intended for stalled requests
+            pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, tls=False):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        if tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(CERT_FILE)
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.connections = set()
+        self.hits = {}
+
+    def handle_error(self, request, client_address):
+        # Clients dropping connections is expected when they time out
+        if isinstance(sys.exc_info()[1], (ConnectionError, ssl.SSLError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class StandInTestCase(unittest.TestCase):
+    tls = False
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandInServer(tls=cls.tls)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+        cls.host = f'127.0.0.1:{cls.server.server_port}'
+        cls.base_url = f'{"https" if cls.tls else "http"}://{cls.host}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.reset()
+
+
+class TransportTest(StandInTestCase):
+
+    def make_session(self, **kwargs):
+        session = requests.Session()
+        self.addCleanup(session.close)
+        stats = configure_session(session, TransportConfig(**kwargs))
+        return session, stats
+
+    def test_gzip_content_length(self):
+        session, stats = self.make_session()
+        resp = session.post(self.base_url + '/lookup')
+
+        self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(resp.content, BODY)
+        self.assertEqual(len(resp.json()), 100)
+        self.assertEqual(stats.num_compressed, 1)
+        self.assertEqual(
+            stats.wire_bytes, int(resp.headers['Content-Length']),
+        )
+        self.assertEqual(stats.body_bytes, len(BODY))
+        self.assertLess(stats.wire_bytes, stats.body_bytes)
+
+    def test_gzip_chunked(self):
+        session, stats = self.make_session()
+        resp = session.post(self.base_url + '/chunked')
+
+        self.assertNotIn('Content-Length', resp.headers)
+        self.assertEqual(resp.content, BODY)
+        self.assertEqual(stats.num_compressed, 1)
+        self.assertEqual(stats.num_unsized, 0)
+        self.assertEqual(stats.wire_bytes, len(gzip.compress(BODY)))
+        self.assertEqual(stats.body_bytes, len(BODY))
+
+    def test_uncompressed_chunked(self):
+        session, stats = self.make_session(compress=False)
+        resp = session.post(self.base_url + '/chunked')
+
+        self.assertNotIn('Content-Encoding', resp.headers)
+        self.assertEqual(resp.content, BODY)
+        self.assertEqual(stats.num_compressed, 0)
+        self.assertEqual(stats.wire_bytes, len(BODY))
+        self.assertEqual(stats.body_bytes, len(BODY))
+
+    def test_keep_alive_reuses_connection(self):
+        session, stats = self.make_session()
+        for _ in range(5):
+            session.post(self.base_url + '/lookup').raise_for_status()
+
+        self.assertEqual(stats.num_requests, 5)
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_no_keep_alive_reconnects(self):
+        session, stats = self.make_session(keep_alive=False)
+        for _ in range(5):
+            session.post(self.base_url + '/lookup').raise_for_status()
+
+        self.assertEqual(stats.num_requests, 5)
+        self.assertEqual(len(self.server.connections), 5)
+
+    def test_stalled_read_times_out_and_retries(self):
+        session, stats = self.make_session(max_retries=2)
+        with self.assertLogs('urllib3', level='WARNING'):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                session.post(self.base_url + '/stall', timeout=(1.0, 0.2))
+
+        # Original attempt, plus both retries
+        self.assertEqual(self.server.hits['stall'], 3)
+        self.assertEqual(stats.num_requests, 0)
+
+
+class ClientTest(StandInTestCase):
+    tls = True
+
+    def make_client(self, **kwargs):
+        api = create_client(
+            tweepy.OAuth1UserHandler('key', 'secret', 'token', 'token_secret'),
+            TransportConfig(**kwargs),
+        )
+        self.addCleanup(api.session.close_pool)
+        api.host = self.host
+        # Ignore any CA bundle or proxy from the environment, which would
+        # otherwise take precedence over the stand-in's certificate
+        api.session.trust_env = False
+        api.session.verify = str(CERT_FILE)
+        return api
+
+    def test_client_reuses_connection(self):
+        api = self.make_client()
+        for _ in range(5):
+            statuses = api.lookup_statuses(id=[1, 2], tweet_mode='extended')
+            self.assertEqual(len(statuses), 100)
+
+        self.assertEqual(self.server.hits['lookup'], 5)
+        self.assertEqual(len(self.server.connections), 1)
+        stats = api._transport_stats
+        self.assertEqual(stats.num_requests, 5)
+        self.assertEqual(stats.num_compressed, 5)
+        self.assertLess(stats.wire_bytes, stats.body_bytes)
+
+    def test_client_no_keep_alive_reconnects(self):
+        api = self.make_client(keep_alive=False)
+        for _ in range(5):
+            api.lookup_statuses(id=[1, 2], tweet_mode='extended')
+
+        self.assertEqual(len(self.server.connections), 5)
+
+    def test_client_timeouts(self):
+        api = self.make_client(
+            connect_timeout=1.5, read_timeout=0.2, max_retries=1,
+        )
+        self.assertEqual(api.timeout, (1.5, 0.2))
+
+        start = time.monotonic()
+        with self.assertLogs('urllib3', level='WARNING'):
+            with self.assertRaises(tweepy.errors.TweepyException):
+                api.request('GET', 'stall')
+        elapsed = time.monotonic() - start
+
+        # Original attempt and one retry, each given up on well before the
+        # server would have responded
+        self.assertEqual(self.server.hits['stall'], 2)
+        self.assertLess(elapsed, STALL_SECS * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
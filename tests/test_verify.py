@@ -0,0 +1,180 @@
+'''
+Checks verifying and repairing saved tweets, against a copy of the fixture
+archive in tests/fixtures/archive. Its expanded directory holds:
+
+    11/1100.json        valid
+    11/1101.json        truncated (with an earlier 1101.json.bad present)
+    11/1102.json        invalid JSON
+    11/1103.json        contains 1100, whose own path is taken
+    11/1104.json        contains 1105, whose own path is free
+    11/1106.json        skeleton
+    11/1107.json        contains 9999, not in the archive
+    11/1200.json        valid, but in the wrong directory
+    99/9900.json        orphan, not in the archive
+
+Run from the repository root with:
+
+    python -m unittest discover -s tests
+'''
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from twitter_archive_expander import (
+    TwitterArchiveFolder,
+    verify_tweet_files,
+)
+
+
+FIXTURE_DIR = Path(__file__).parent / 'fixtures' / 'archive'
+USER_DICT = {'id_str': '42', 'screen_name': 'someone'}
+
+
+class VerifyTest(unittest.TestCase):
+
+    def setUp(self):
+        # Repairs modify the tree, so always work on a copy
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.base_dir = Path(temp_dir.name) / 'archive'
+        shutil.copytree(FIXTURE_DIR, self.base_dir)
+        self.expanded_dir = self.base_dir / 'expanded'
+        self.archive = TwitterArchiveFolder(
+            self.base_dir, user_dict=USER_DICT,
+        )
+
+    def saved_files(self):
+        return sorted(
+            str(p.relative_to(self.expanded_dir))
+            for p in self.expanded_dir.rglob('*') if p.is_file()
+        )
+
+    def issues_by_name(self, issues):
+        return {
+            str(issue.path.relative_to(self.expanded_dir)): issue
+            for issue in issues
+        }
+
+    def reload(self):
+        archive = TwitterArchiveFolder(self.base_dir, user_dict=USER_DICT)
+        archive.load_tweets()
+        return archive
+
+    def test_verify_tweet_files(self):
+        found_ids, issues = verify_tweet_files([
+            self.expanded_dir / '11' / '1100.json',
+            self.expanded_dir / '11' / '1101.json',
+            self.expanded_dir / '11' / '1106.json',
+        ])
+
+        self.assertEqual(found_ids, [1100, 1106])
+        self.assertEqual(
+            [(i.kind, i.tweet_id) for i in issues],
+            [('truncated', 1101), ('skeleton', 1106)],
+        )
+
+    def test_verify_reports_issues(self):
+        issues = self.issues_by_name(
+            self.archive.verify_tweets(max_workers=2)
+        )
+
+        self.assertEqual(
+            {name: issue.kind for name, issue in issues.items()},
+            {
+                '11/1101.json': 'truncated',
+                '11/1102.json': 'invalid',
+                '11/1103.json': 'mismatch',
+                '11/1104.json': 'mismatch',
+                '11/1106.json': 'skeleton',
+                '11/1107.json': 'mismatch',
+                '11/1200.json': 'mismatch',
+                '99/9900.json': 'orphan',
+            },
+        )
+        self.assertEqual(issues['11/1103.json'].content_id, 1100)
+        self.assertEqual(issues['11/1107.json'].content_id, 9999)
+        self.assertEqual(
+            issues['11/1200.json'].detail, 'saved under wrong directory',
+        )
+
+    def test_verify_without_repair_changes_nothing(self):
+        before = self.saved_files()
+        self.archive.verify_tweets(max_workers=2)
+
+        self.assertEqual(self.saved_files(), before)
+
+    def test_repair(self):
+        self.archive.verify_tweets(repair=True, max_workers=2)
+
+        self.assertEqual(self.saved_files(), [
+            '11/1100.json',
+            # Truncated, with the earlier quarantined file kept
+            '11/1101.json.bad',
+            '11/1101.json.bad.1',
+            # Invalid
+            '11/1102.json.bad',
+            # Misplaced, but its own path was already taken
+            '11/1103.json.bad',
+            # Misplaced 1104.json, moved to its own path
+            '11/1105.json',
+            # Skeleton left as is
+            '11/1106.json',
+            # Moved from the wrong directory
+            '12/1200.json',
+            # Orphan left as is
+            '99/9900.json',
+            # Was hiding archived tweet 1107, moved to its own path
+            '99/9999.json',
+        ])
+        self.assertEqual(
+            (self.expanded_dir / '11' / '1101.json.bad').read_text(),
+            'earlier quarantined file\n',
+        )
+
+        archive = self.reload()
+        self.assertEqual(sorted(archive.processed), [1100, 1105, 1106, 1200])
+        self.assertEqual(
+            [t.id for t in archive.to_process],
+            [1101, 1102, 1103, 1104, 1107],
+        )
+        # No longer loaded in place of the archived tweet
+        self.assertEqual(archive.processed[1105].contents['id_str'], '1105')
+
+    def test_repair_requeue_skeletons(self):
+        self.archive.verify_tweets(
+            repair=True, requeue_skeletons=True, max_workers=2,
+        )
+
+        self.assertNotIn('11/1106.json', self.saved_files())
+        self.assertIn('11/1106.json.bad', self.saved_files())
+        archive = self.reload()
+        self.assertIn(1106, [t.id for t in archive.to_process])
+
+    def test_repair_is_idempotent(self):
+        self.archive.verify_tweets(repair=True, max_workers=2)
+        issues = self.archive.verify_tweets(repair=True, max_workers=2)
+
+        self.assertEqual(
+            sorted((i.kind, i.tweet_id) for i in issues),
+            [('orphan', 9900), ('orphan', 9999), ('skeleton', 1106)],
+        )
+
+    def test_quarantine_keeps_earlier_files(self):
+        tweet_path = self.expanded_dir / '11' / '1101.json'
+        bad_path = self.archive._quarantine_tweet_file(tweet_path)
+        self.assertEqual(bad_path.name, '1101.json.bad.1')
+
+        tweet_path.write_text('{}')
+        bad_path = self.archive._quarantine_tweet_file(tweet_path)
+        self.assertEqual(bad_path.name, '1101.json.bad.2')
+
+        self.assertFalse(tweet_path.exists())
+        self.assertEqual(
+            (self.expanded_dir / '11' / '1101.json.bad').read_text(),
+            'earlier quarantined file\n',
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
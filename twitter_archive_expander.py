@@ -2,19 +2,32 @@
 from __future__ import annotations
 
 import argparse
+import gzip
 import io
 import json
 import logging
 import os
+import zlib
 from collections import deque
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from dataclasses import dataclass
 from pathlib import Path
-from time import sleep
+from time import perf_counter, sleep
 from typing import Any, Optional, Union
 
+import requests
+import requests.adapters
+import requests.models
 import tweepy
 import tweepy.errors
 import tweepy.models
+import urllib3.exceptions
+from urllib3.util.retry import Retry
 
 
 ### Logging setup
@@ -253,10 +266,14 @@ def ensure_user_profile(base_dir: Path, api: tweepy.API) -> dict:
 
     return user_dict
 
-def setup_client(base_dir: Optional[Path]) -> tweepy.API:
+def setup_client(
+    base_dir: Optional[Path],
+    transport: Optional[TransportConfig] = None,
+) -> tweepy.API:
     '''
     Ensures consumer creds and access token, and returns instantiated API
     client (v1). If base_dir is None, current working directory is assumed.
+    If transport is None, default transport settings are used.
     '''
     if base_dir is None:
         base_dir = Path.cwd()
@@ -265,13 +282,218 @@ def setup_client(base_dir: Optional[Path]) -> tweepy.API:
     access_token, access_token_secret = ensure_access_token(
         base_dir, consumer_key, consumer_secret
     )
-    api = tweepy.API(tweepy.OAuth1UserHandler(
-        consumer_key, consumer_secret, access_token, access_token_secret,
-    ))
+    api = create_client(
+        tweepy.OAuth1UserHandler(
+            consumer_key, consumer_secret, access_token, access_token_secret,
+        ),
+        transport=transport,
+    )
+
+    return api
+
+def create_client(
+    auth: tweepy.OAuth1UserHandler,
+    transport: Optional[TransportConfig] = None,
+) -> tweepy.API:
+    '''
+    Returns API client (v1) using the given auth handler, with transport
+    settings applied. If transport is None, default transport settings are
+    used. The client's session should be closed with close_pool() when done.
+    '''
+    if transport is None:
+        transport = TransportConfig()
+
+    api = tweepy.API(
+        auth,
+        proxy=transport.proxy,
+        timeout=(transport.connect_timeout, transport.read_timeout),
+    )
+    # Tweepy closes its session after every request, which would also close
+    # any pooled connections, so give it one which only closes when asked
+    api.session = PooledSession()
+
+    # Cache transport stats for later
+    api._transport_stats = configure_session(api.session, transport)  # type: ignore
 
     return api
 
 
+### Transport
+
+@dataclass
+class TransportConfig:
+    connect_timeout: float = 10.0
+    read_timeout: float = 60.0
+    pool_size: int = 4
+    max_retries: int = 3
+    keep_alive: bool = True
+    compress: bool = True
+    proxy: Optional[str] = None
+
+
+class PooledSession(requests.Session):
+    '''
+    Session which keeps its connection pool open when closed, so connections
+    can be reused across requests by clients which close the session after
+    each one. Use close_pool() to actually close it.
+    '''
+
+    def close(self) -> None:
+        pass
+
+    def close_pool(self) -> None:
+        super().close()
+
+
+@dataclass
+class TransportStats:
+    num_requests: int = 0
+    num_compressed: int = 0
+    num_unsized: int = 0
+    wire_bytes: int = 0
+    body_bytes: int = 0
+    total_latency: float = 0.0
+
+    def record_response(self, resp: requests.Response, **kwargs) -> None:
+        '''
+        Response hook for requests: reads the response body, and records
+        bytes transferred and decoded, and latency including the body.
+        '''
+        start = perf_counter()
+        body, wire_bytes = read_response_body(resp)
+        body_bytes = len(body)
+        latency = resp.elapsed.total_seconds() + (perf_counter() - start)
+        encoding = resp.headers.get('Content-Encoding', 'identity')
+
+        self.num_requests += 1
+        if encoding != 'identity':
+            self.num_compressed += 1
+        # Sizes are only compared where both are known, so an unknown size
+        # can't skew the ratio
+        if wire_bytes is None:
+            self.num_unsized += 1
+        else:
+            self.wire_bytes += wire_bytes
+            self.body_bytes += body_bytes
+        self.total_latency += latency
+
+        wire_desc = 'unknown' if wire_bytes is None else str(wire_bytes)
+        log.debug(
+            f'{resp.request.method} {resp.request.path_url} '
+            f'{resp.status_code}: {wire_desc} bytes ({encoding}), '
+            f'{body_bytes} decoded, {latency:.3f}s'
+        )
+
+    def summary(self) -> str:
+        if self.num_requests == 0:
+            return 'No requests made'
+        ratio = self.wire_bytes / self.body_bytes if self.body_bytes else 1.0
+        unsized = (
+            f' ({self.num_unsized} of unknown size)'
+            if self.num_unsized else ''
+        )
+        return (
+            f'{self.num_requests} requests '
+            f'({self.num_compressed} compressed), '
+            f'{self.wire_bytes} bytes transferred for {self.body_bytes} '
+            f'decoded ({ratio:.0%}){unsized}, '
+            f'{self.total_latency / self.num_requests:.3f}s mean latency'
+        )
+
+
+def read_response_body(
+    resp: requests.Response,
+) -> tuple[bytes, Optional[int]]:
+    '''
+    Reads and decodes the body of resp, counting the bytes received before
+    decoding. Returns a tuple of the decoded body, and the number of bytes
+    received, or None if that couldn't be determined.
+    '''
+    encoding = resp.headers.get('Content-Encoding', 'identity').lower()
+    content_length = resp.headers.get('Content-Length')
+    if (resp.raw is None or resp._content_consumed or
+            encoding not in ('identity', 'gzip', 'x-gzip', 'deflate')):
+        # Can't count the raw stream, so rely on the server's word for it
+        body = resp.content
+        if content_length is not None and content_length.isdigit():
+            return body, int(content_length)
+        return body, None
+
+    # The raw stream's own position can't be trusted for this (chunked
+    # responses don't advance it in some urllib3 versions), so read it
+    # undecoded, count, then decode as requests would have
+    try:
+        raw_body = b''.join(resp.raw.stream(
+            requests.models.CONTENT_CHUNK_SIZE, decode_content=False,
+        ))
+        if encoding in ('gzip', 'x-gzip') and raw_body:
+            body = gzip.decompress(raw_body)
+        elif encoding == 'deflate' and raw_body:
+            try:
+                body = zlib.decompress(raw_body)
+            except zlib.error:
+                # Some servers send deflate without the zlib header
+                body = zlib.decompress(raw_body, -zlib.MAX_WBITS)
+        else:
+            body = raw_body
+    # Surface stream errors the same way requests itself would
+    except urllib3.exceptions.ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e) from e
+    except urllib3.exceptions.ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e) from e
+    except (OSError, EOFError, zlib.error) as e:
+        raise requests.exceptions.ContentDecodingError(
+            f'Could not decode {encoding} response body: {e}'
+        ) from e
+
+    # Hand the body back to requests as if it had read it
+    resp._content = body
+    resp._content_consumed = True
+
+    return body, len(raw_body)
+
+
+def configure_session(
+    session: requests.Session,
+    transport: TransportConfig,
+) -> TransportStats:
+    '''
+    Applies connection pooling, retries, keep-alive and compression settings
+    from transport to session, and returns a stats object which will be
+    updated with each response.
+    '''
+    # Only connection and read failures are retried here; error statuses
+    # (429s especially) are left for the caller. All methods are retried,
+    # as the POSTs this client makes are lookups, and safe to repeat.
+    retry = Retry(
+        total=transport.max_retries,
+        connect=transport.max_retries,
+        read=transport.max_retries,
+        status=0,
+        allowed_methods=None,
+        backoff_factor=1,
+        raise_on_status=False,
+    )
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=transport.pool_size,
+        pool_maxsize=transport.pool_size,
+        max_retries=retry,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    if not transport.keep_alive:
+        session.headers['Connection'] = 'close'
+    session.headers['Accept-Encoding'] = (
+        'gzip, deflate' if transport.compress else 'identity'
+    )
+
+    stats = TransportStats()
+    session.hooks['response'].append(stats.record_response)
+
+    return stats
+
+
 ### Parsing
 
 def skip_until_byte(
@@ -381,6 +603,92 @@ class TweetJSON:
         return self.id >= other.id
 
 
+@dataclass
+class TweetFileIssue:
+    path: Path
+    kind: str
+    tweet_id: Optional[int] = None
+    detail: str = ''
+    content_id: Optional[int] = None
+
+
+def verify_tweet_files(
+    tweet_paths: list[Path],
+) -> tuple[list[int], list[TweetFileIssue]]:
+    '''
+    Check each saved tweet file in tweet_paths parses as a tweet, and is
+    saved under the path for its own id. Returns a tuple of the ids of all
+    usable tweets found, and a list of any issues. Runs in a worker process,
+    so only reports, and never modifies files.
+    '''
+    found_ids: list[int] = []
+    issues: list[TweetFileIssue] = []
+
+    for tweet_path in tweet_paths:
+        name_id = tweet_path.stem
+        if not name_id.isdigit():
+            issues.append(TweetFileIssue(
+                tweet_path, 'mismatch', detail='file name is not a tweet id',
+            ))
+            continue
+
+        try:
+            data = tweet_path.read_bytes()
+        except OSError as e:
+            issues.append(TweetFileIssue(
+                tweet_path, 'unreadable', int(name_id), str(e),
+            ))
+            continue
+
+        try:
+            contents = json.loads(data)
+        except ValueError as e:
+            # Saved files are always a single object, so anything that stops
+            # short of a closing brace was most likely cut off mid-write
+            if data.rstrip().endswith(b'}'):
+                kind = 'invalid'
+            else:
+                kind = 'truncated'
+            issues.append(TweetFileIssue(
+                tweet_path, kind, int(name_id), str(e),
+            ))
+            continue
+
+        content_id = (
+            contents.get('id_str') if isinstance(contents, dict) else None
+        )
+        if not isinstance(content_id, str) or not content_id.isdigit():
+            issues.append(TweetFileIssue(
+                tweet_path, 'invalid', int(name_id), 'not a tweet object',
+            ))
+            continue
+
+        if content_id != name_id:
+            issues.append(TweetFileIssue(
+                tweet_path, 'mismatch', int(name_id),
+                f'contains tweet {content_id}', int(content_id),
+            ))
+            continue
+        if tweet_path.parent.name != name_id[0:2]:
+            issues.append(TweetFileIssue(
+                tweet_path, 'mismatch', int(name_id),
+                'saved under wrong directory', int(content_id),
+            ))
+            continue
+
+        # Skeletons are stored for tweets which couldn't be fetched, and have
+        # only the bare user id filled in
+        user = contents.get('user')
+        if not isinstance(user, dict) or set(user) <= {'id', 'id_str'}:
+            issues.append(TweetFileIssue(
+                tweet_path, 'skeleton', int(name_id), 'no full user object',
+            ))
+
+        found_ids.append(int(name_id))
+
+    return found_ids, issues
+
+
 class TwitterArchiveFolder:
     '''
     Represents an extracted Twitter archive folder, latest version as of 2022.
@@ -390,8 +698,11 @@ class TwitterArchiveFolder:
     TARGET_DIR_NAME = 'expanded'
     ACCOUNT_FILE_NAME = 'account.js'
     TWEETS_FILE_NAMES = ('tweets.js', 'tweet.js')
+    TWEETS_JS_PREFIX = 'window.YTD.tweets.part0 = '
+    EXPORT_FORMATS = ('ndjson', 'js')
+    QUARANTINE_SUFFIX = '.bad'
 
-    api: tweepy.API
+    api: Optional[tweepy.API]
     user_id: str
     base_dir: Path
     tweets_file: Path
@@ -402,6 +713,7 @@ class TwitterArchiveFolder:
         self,
         base_dir: Union[Path, str],
         api: Optional[tweepy.API] = None,
+        user_dict: Optional[dict] = None,
     ) -> None:
         if isinstance(base_dir, str):
             self.base_dir = Path(base_dir)
@@ -411,8 +723,11 @@ class TwitterArchiveFolder:
         self.to_process = []
 
         # Use existing API client with implied user, if given, otherwise
-        # setup a new client and all the credentials
-        if api:
+        # setup a new client and all the credentials -- unless a user profile
+        # is given directly, in which case no API access is required
+        if user_dict is not None:
+            self.api = api
+        elif api:
             self.api = api
             user_dict = getattr(api, '_user_dict', None)
             if user_dict is None:
@@ -525,11 +840,24 @@ class TwitterArchiveFolder:
                 'id_str': self.user_id,
             }
 
+    def _get_api(self) -> tweepy.API:
+        '''
+        Return the API client, which is required for fetching, but not when
+        the archive was opened offline with only a user profile.
+        '''
+        if self.api is None:
+            raise RuntimeError(
+                f'No API client for archive at {self.base_dir}, '
+                f'cannot fetch tweets'
+            )
+        return self.api
+
     def _fetch_tweet_json(self, tweet: TweetJSON) -> None:
+        api = self._get_api()
         try:
             # Fetch with full information if possible
             log.info(f'Fetching single tweet {tweet.id}')
-            t = self.api.get_status(
+            t = api.get_status(
                 tweet.id_str,
                 include_ext_alt_text=True,
                 tweet_mode='extended',
@@ -544,8 +872,9 @@ class TwitterArchiveFolder:
         self,
         tweets: list[TweetJSON],
     ) -> None:
+        api = self._get_api()
         log.info(f'Fetching {len(tweets)} tweets...')
-        fetched = self.api.lookup_statuses(
+        fetched = api.lookup_statuses(
             id=[tweet.id for tweet in tweets],
             include_ext_alt_text=True,
             tweet_mode='extended',
@@ -649,11 +978,296 @@ class TwitterArchiveFolder:
             t for t in self.to_process if t.id not in self.processed
         ]
 
+    def export_tweets(
+        self,
+        output_file: Path,
+        output_format: str = 'ndjson',
+        compress: Optional[bool] = None,
+        max_workers: Optional[int] = None,
+    ) -> int:
+        '''
+        Write all tweets in the archive to output_file in ascending id order,
+        using the expanded version where saved and the original archive entry
+        otherwise. Output is either newline-delimited JSON, or a replacement
+        tweets.js file. Saved tweets are streamed from disk by a pool of
+        readers rather than loaded up front. Returns the number of tweets
+        written. The output is written to a temporary file alongside, and
+        only moved to output_file once complete.
+        '''
+        if output_format not in self.EXPORT_FORMATS:
+            raise ValueError(f'Unknown export format "{output_format}"')
+        if compress is None:
+            compress = output_file.suffix == '.gz'
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        # Enough reads in flight to keep the writer busy, without the queue
+        # growing with the size of the archive
+        max_pending = max_workers * 4
+
+        # The archive entries are needed as fallbacks, but are dropped as soon
+        # as each tweet is written
+        archived: dict[int, dict[str, Any]] = {}
+        for item in parse_js_file_list(self.tweets_file):
+            raw_tweet = item['tweet']
+            archived[int(raw_tweet['id_str'])] = raw_tweet
+        tweet_ids = sorted(archived)
+
+        def load_saved(tweet_id: int) -> TweetJSON:
+            tweet = TweetJSON(tweet_id, self.user_id)
+            self._load_tweet_json(tweet)
+            # A file holding some other tweet would break the ordering, and
+            # duplicate that tweet while dropping this one
+            if tweet.saved_at is not None:
+                content_id = (
+                    tweet.contents.get('id_str')
+                    if isinstance(tweet.contents, dict) else None
+                )
+                if content_id != tweet.id_str:
+                    raise ValueError(f'contains tweet {content_id}')
+            return tweet
+
+        temp_file = output_file.with_name(f'.{output_file.name}.tmp')
+        if compress:
+            out = gzip.open(temp_file, 'wt', encoding='utf-8')
+        else:
+            out = temp_file.open('w', encoding='utf-8')
+
+        num_written = 0
+        num_expanded = 0
+
+        def write_tweet(tweet_id: int, pending_load: Future) -> None:
+            nonlocal num_written, num_expanded
+            contents = archived.pop(tweet_id)
+            try:
+                tweet = pending_load.result()
+            except (OSError, ValueError) as e:
+                log.warning(
+                    f'Could not load saved tweet {tweet_id}, '
+                    f'using archived version: {e}'
+                )
+            else:
+                if tweet.saved_at is not None and tweet.contents is not None:
+                    contents = tweet.contents
+                    num_expanded += 1
+
+            if output_format == 'ndjson':
+                out.write(json.dumps(contents, ensure_ascii=False))
+                out.write('\n')
+            else:
+                if num_written > 0:
+                    out.write(',\n')
+                out.write(json.dumps(
+                    {'tweet': contents}, ensure_ascii=False, indent=2,
+                ))
+            num_written += 1
+
+        try:
+            with out, ThreadPoolExecutor(max_workers=max_workers) as pool:
+                if output_format == 'js':
+                    out.write(self.TWEETS_JS_PREFIX + '[\n')
+
+                # Reads complete out of order, but are written in submission
+                # order, so the output remains sorted
+                pending: deque[tuple[int, Future]] = deque()
+                for tweet_id in tweet_ids:
+                    pending.append(
+                        (tweet_id, pool.submit(load_saved, tweet_id))
+                    )
+                    if len(pending) >= max_pending:
+                        write_tweet(*pending.popleft())
+                while pending:
+                    write_tweet(*pending.popleft())
+
+                if output_format == 'js':
+                    out.write('\n]\n')
+        except BaseException:
+            # Don't leave a partial export behind
+            temp_file.unlink(missing_ok=True)
+            raise
+        temp_file.replace(output_file)
+
+        log.info(
+            f'Exported {num_written} tweets to {output_file} '
+            f'({num_expanded} expanded, '
+            f'{num_written - num_expanded} from archive)'
+        )
+
+        return num_written
+
+    def _quarantine_tweet_file(self, tweet_path: Path) -> Path:
+        '''
+        Move a bad tweet file aside, so the tweet it was saved for is treated
+        as unprocessed by the next load. Any file previously moved aside for
+        the same tweet is kept, and a numbered name used instead.
+        '''
+        bad_path = tweet_path.with_name(
+            tweet_path.name + self.QUARANTINE_SUFFIX
+        )
+        num = 0
+        while bad_path.exists():
+            num += 1
+            bad_path = tweet_path.with_name(
+                f'{tweet_path.name}{self.QUARANTINE_SUFFIX}.{num}'
+            )
+        tweet_path.replace(bad_path)
+        log.info(f'Moved {tweet_path} to {bad_path}')
+        return bad_path
+
+    def _repair_tweet_file(
+        self,
+        issue: TweetFileIssue,
+        requeue_skeletons: bool,
+    ) -> Optional[str]:
+        '''
+        Attempt to repair the tweet file with the given issue. Returns
+        'moved' if the file was moved to its correct path, 'quarantined' if
+        it was moved aside to be fetched again, or None if left unchanged.
+        '''
+        if issue.kind in ('unreadable', 'truncated', 'invalid'):
+            self._quarantine_tweet_file(issue.path)
+            return 'quarantined'
+
+        if issue.kind == 'mismatch' and issue.content_id is not None:
+            # A valid tweet in the wrong place can be moved to where it should
+            # be, as long as that doesn't clobber anything -- if it's not in
+            # the archive, that leaves it as an ordinary orphan
+            tweet_path = self._get_tweet_save_path(str(issue.content_id))
+            if not tweet_path.exists():
+                tweet_path.parent.mkdir(parents=True, exist_ok=True)
+                issue.path.replace(tweet_path)
+                log.info(f'Moved {issue.path} to {tweet_path}')
+                return 'moved'
+            self._quarantine_tweet_file(issue.path)
+            return 'quarantined'
+
+        if issue.kind == 'skeleton' and requeue_skeletons:
+            self._quarantine_tweet_file(issue.path)
+            return 'quarantined'
+
+        # Orphans are left alone, since they may well be wanted
+        return None
+
+    def verify_tweets(
+        self,
+        repair: bool = False,
+        requeue_skeletons: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> list[TweetFileIssue]:
+        '''
+        Check all saved tweets in parallel for unparseable files, files saved
+        under the wrong id or path, skeletons of unfetchable tweets, and
+        orphans not present in the archive. If repair is True, bad files are
+        moved aside or into place, so any affected tweets are fetched again by
+        the next processing run; skeletons are only refetched if
+        requeue_skeletons is also True. Returns the list of issues found.
+        '''
+        chunk_size = 1000
+
+        archived_ids = {
+            int(item['tweet']['id_str'])
+            for item in parse_js_file_list(self.tweets_file)
+        }
+
+        # Listing is cheap next to parsing, so done here, and the files
+        # handed out to the pool in chunks
+        target_dir = self.base_dir / self.TARGET_DIR_NAME
+        chunks: list[list[Path]] = []
+        chunk: list[Path] = []
+        if target_dir.is_dir():
+            for prefix_entry in os.scandir(target_dir):
+                if not prefix_entry.is_dir():
+                    continue
+                for entry in os.scandir(prefix_entry.path):
+                    if not entry.name.endswith('.json'):
+                        continue
+                    chunk.append(Path(entry.path))
+                    if len(chunk) >= chunk_size:
+                        chunks.append(chunk)
+                        chunk = []
+        if chunk:
+            chunks.append(chunk)
+        num_files = sum(len(c) for c in chunks)
+        log.info(f'Verifying {num_files} saved tweets...')
+
+        found_ids: set[int] = set()
+        issues: list[TweetFileIssue] = []
+        num_checked = 0
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            pending = {
+                pool.submit(verify_tweet_files, c): len(c) for c in chunks
+            }
+            for done in as_completed(pending):
+                chunk_ids, chunk_issues = done.result()
+                found_ids.update(chunk_ids)
+                issues.extend(chunk_issues)
+                num_checked += pending[done]
+                log.debug(f'Verified {num_checked}/{num_files} saved tweets')
+
+        for tweet_id in sorted(found_ids - archived_ids):
+            issues.append(TweetFileIssue(
+                self._get_tweet_save_path(str(tweet_id)), 'orphan', tweet_id,
+                'not in archive',
+            ))
+        # Misplaced tweets are only orphans if neither the tweet nor the path
+        # it's saved under belong to the archive -- otherwise they hide an
+        # archived tweet, which would be loaded with the wrong contents, so
+        # still need repairing
+        for issue in issues:
+            if (issue.kind == 'mismatch' and
+                    issue.content_id is not None and
+                    issue.content_id not in archived_ids and
+                    issue.tweet_id not in archived_ids):
+                issue.kind = 'orphan'
+                issue.detail += ', not in archive'
+        issues.sort(key=lambda i: (i.tweet_id or 0, str(i.path)))
+
+        counts: dict[str, int] = {}
+        for issue in issues:
+            counts[issue.kind] = counts.get(issue.kind, 0) + 1
+            # Skeletons are the usual outcome for deleted tweets, so may be
+            # very numerous, and orphans aren't errors as such
+            if issue.kind == 'skeleton':
+                log_level = logging.DEBUG
+            elif issue.kind == 'orphan':
+                log_level = logging.INFO
+            else:
+                log_level = logging.WARNING
+            log.log(
+                log_level, f'{issue.kind}: {issue.path} ({issue.detail})',
+            )
+        log.info(
+            f'Verified {num_files} saved tweets: '
+            + (
+                ', '.join(f'{n} {kind}' for kind, n in sorted(counts.items()))
+                or 'no issues'
+            )
+        )
+        num_unsaved = len(archived_ids - found_ids)
+        log.info(f'{num_unsaved} tweets in archive not yet processed')
+
+        if repair:
+            num_moved = 0
+            num_quarantined = 0
+            for issue in issues:
+                action = self._repair_tweet_file(issue, requeue_skeletons)
+                if action == 'moved':
+                    num_moved += 1
+                elif action == 'quarantined':
+                    num_quarantined += 1
+            log.info(f'Moved {num_moved} misplaced files into place')
+            log.info(
+                f'Moved {num_quarantined} bad files aside, '
+                f'affected tweets will be fetched on the next run'
+            )
+
+        return issues
+
 
 def main(
     archive_dir: Union[str, Path],
     creds_dir: Optional[Union[str, Path]] = None,
     fetch_max: Optional[int] = None,
+    transport: Optional[TransportConfig] = None,
 ) -> None:
     if isinstance(archive_dir, str):
         archive_dir = Path(archive_dir)
@@ -666,7 +1280,7 @@ def main(
     creds_dir = creds_dir.resolve()
 
     # Will ensure consumer creds and access token are set
-    api = setup_client(creds_dir)
+    api = setup_client(creds_dir, transport=transport)
     user_dict = ensure_user_profile(creds_dir, api)
     log.info(f'Accessing Twitter API as {user_dict["screen_name"]}')
 
@@ -684,8 +1298,72 @@ def main(
     log.info(f'{len(archive.processed)} tweets already processed')
     log.info(f'{num_to_process} tweets will be processed')
 
-    archive.process_tweets(
-        max_to_process=fetch_max if fetch_max is not None else num_to_process
+    try:
+        archive.process_tweets(
+            max_to_process=(
+                fetch_max if fetch_max is not None else num_to_process
+            )
+        )
+    finally:
+        log.info(f'API transport: {api._transport_stats.summary()}')  # type: ignore
+        api.session.close_pool()
+
+def export_archive(
+    archive_dir: Union[str, Path],
+    output_file: Union[str, Path],
+    creds_dir: Optional[Union[str, Path]] = None,
+    output_format: str = 'ndjson',
+    compress: Optional[bool] = None,
+    max_workers: Optional[int] = None,
+) -> None:
+    if isinstance(archive_dir, str):
+        archive_dir = Path(archive_dir)
+    archive_dir = archive_dir.resolve()
+
+    if isinstance(output_file, str):
+        output_file = Path(output_file)
+
+    if creds_dir is None:
+        creds_dir = Path.cwd()
+    elif isinstance(creds_dir, str):
+        creds_dir = Path(creds_dir)
+    creds_dir = creds_dir.resolve()
+
+    # No API access needed, only the saved profile to validate the archive
+    user_dict = load_user_profile(creds_dir / 'user.json')
+    archive = TwitterArchiveFolder(archive_dir, user_dict=user_dict)
+    log.info(f'Exporting tweets from archive to {output_file}...')
+    archive.export_tweets(
+        output_file,
+        output_format=output_format,
+        compress=compress,
+        max_workers=max_workers,
+    )
+
+def verify_archive(
+    archive_dir: Union[str, Path],
+    creds_dir: Optional[Union[str, Path]] = None,
+    repair: bool = False,
+    requeue_skeletons: bool = False,
+    max_workers: Optional[int] = None,
+) -> None:
+    if isinstance(archive_dir, str):
+        archive_dir = Path(archive_dir)
+    archive_dir = archive_dir.resolve()
+
+    if creds_dir is None:
+        creds_dir = Path.cwd()
+    elif isinstance(creds_dir, str):
+        creds_dir = Path(creds_dir)
+    creds_dir = creds_dir.resolve()
+
+    # No API access needed, only the saved profile to validate the archive
+    user_dict = load_user_profile(creds_dir / 'user.json')
+    archive = TwitterArchiveFolder(archive_dir, user_dict=user_dict)
+    archive.verify_tweets(
+        repair=repair,
+        requeue_skeletons=requeue_skeletons,
+        max_workers=max_workers,
     )
 
 if __name__ == '__main__':
@@ -710,11 +1388,132 @@ if __name__ == '__main__':
         '-m', '--fetch-max', type=int, required=False,
         help='Maximum number of tweets to fetch from the API'
     )
+    parser.add_argument(
+        '--connect-timeout', type=float,
+        default=TransportConfig.connect_timeout, metavar='SECS',
+        help=(
+            f'Timeout for connecting to the API '
+            f'(default {TransportConfig.connect_timeout:g})'
+        )
+    )
+    parser.add_argument(
+        '--read-timeout', type=float,
+        default=TransportConfig.read_timeout, metavar='SECS',
+        help=(
+            f'Timeout for each read from the API '
+            f'(default {TransportConfig.read_timeout:g})'
+        )
+    )
+    parser.add_argument(
+        '--retries', type=int, default=TransportConfig.max_retries,
+        help=(
+            f'Times to retry a failed connection or read '
+            f'(default {TransportConfig.max_retries})'
+        )
+    )
+    parser.add_argument(
+        '--pool-size', type=int, default=TransportConfig.pool_size,
+        help=(
+            f'Maximum connections kept open to the API '
+            f'(default {TransportConfig.pool_size})'
+        )
+    )
+    parser.add_argument(
+        '--proxy', type=str, required=False, metavar='URL',
+        help='Proxy to use for API requests'
+    )
+    parser.add_argument(
+        '--no-keep-alive', action='store_false', dest='keep_alive',
+        help='Close API connections after each request'
+    )
+    parser.add_argument(
+        '--no-compression', action='store_false', dest='compress',
+        help='Do not request compressed API responses'
+    )
+    mode_group = parser.add_mutually_exclusive_group()
+    mode_group.add_argument(
+        '-e', '--export', type=Path, required=False, metavar='FILE',
+        help=(
+            'Export all tweets in id order to FILE instead of fetching, '
+            'using archived versions for any not yet expanded'
+        )
+    )
+    parser.add_argument(
+        '-f', '--export-format', choices=TwitterArchiveFolder.EXPORT_FORMATS,
+        help=(
+            'Export as newline-delimited JSON, or as a replacement tweets.js '
+            '(default ndjson)'
+        )
+    )
+    parser.add_argument(
+        '-z', '--gzip', action='store_true', default=None,
+        help='Compress exported file (default if FILE ends with .gz)'
+    )
+    mode_group.add_argument(
+        '--verify', action='store_true',
+        help='Check saved tweets for errors instead of fetching'
+    )
+    parser.add_argument(
+        '--repair', action='store_true',
+        help=(
+            'With --verify, move bad files aside so their tweets are fetched '
+            'again on the next run'
+        )
+    )
+    parser.add_argument(
+        '--retry-skeletons', action='store_true',
+        help=(
+            'With --repair, also fetch again tweets which previously '
+            'could not be fetched'
+        )
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, required=False,
+        help='Number of parallel workers for exporting or verifying'
+    )
 
     args = parser.parse_args()
     # print(args.__repr__())
-    main(
-        args.archive_dir,
-        creds_dir=args.creds_dir,
-        fetch_max=args.fetch_max,
-    )
+    # Options only meaningful for another mode would otherwise fall through
+    # to a full fetch run, which is never what was intended
+    if args.repair and not args.verify:
+        parser.error('--repair requires --verify')
+    if args.retry_skeletons and not args.repair:
+        parser.error('--retry-skeletons requires --repair')
+    if args.export is None:
+        if args.export_format is not None:
+            parser.error('--export-format requires --export')
+        if args.gzip is not None:
+            parser.error('--gzip requires --export')
+    if args.verify:
+        verify_archive(
+            args.archive_dir,
+            creds_dir=args.creds_dir,
+            repair=args.repair,
+            requeue_skeletons=args.retry_skeletons,
+            max_workers=args.jobs,
+        )
+    elif args.export is not None:
+        export_archive(
+            args.archive_dir,
+            args.export,
+            creds_dir=args.creds_dir,
+            output_format=args.export_format or 'ndjson',
+            compress=args.gzip,
+            max_workers=args.jobs,
+        )
+    else:
+        main(
+            args.archive_dir,
+            creds_dir=args.creds_dir,
+            fetch_max=args.fetch_max,
+            transport=TransportConfig(
+                connect_timeout=args.connect_timeout,
+                read_timeout=args.read_timeout,
+                pool_size=args.pool_size,
+                max_retries=args.retries,
+                keep_alive=args.keep_alive,
+                compress=args.compress,
+                proxy=args.proxy,
+            ),
+        )